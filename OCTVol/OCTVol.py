@@ -4,6 +4,56 @@ A module to read, write, and crop optical coherence tomography images from Heide
 
 import numpy as np
 import datetime
+import math
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Layout of the 2048 byte file header (little-endian, no padding between the fields)
+_HEADER_STRUCT = struct.Struct('<12siiidddiiddid4sQii16s16si21s3bdi24sdii1832s')
+# Layout of the fixed part of each B scan header (256 bytes), the segmentation follows at off_seg
+_BSCAN_HDR_DTYPE = np.dtype([('version', 'S12'), ('b_scan_hdr_size', '<i4'), ('start_x', '<f8'), ('start_y', '<f8'),
+                             ('end_x', '<f8'), ('end_y', '<f8'), ('num_seg', '<i4'), ('off_seg', '<i4'),
+                             ('quality', '<f4'), ('shift', '<i4'), ('spare', 'i1', (192,))])
+# Layout of the thickness grid up to the sector part
+_THICKNESS_GRID_STRUCT = struct.Struct('<i3d2d4f')
+# Layout of each of the 9 sectors at the end of the thickness grid
+_SECTOR_DTYPE = np.dtype([('thickness', '<f4'), ('volume', '<f4')])
+
+
+def _read(vf, dtype, count=None):
+    """
+    Read a scalar (count None) or an array of count items of the given dtype from the current position of the file.
+    """
+    data = np.empty(1 if count is None else count, dtype=dtype)
+    if vf.readinto(memoryview(data).cast('B')) != data.nbytes:
+        raise EOFError('Unexpected end of the vol file.')
+    return data[0] if count is None else data
+
+
+def _legacy_index(key, prefix, count):
+    """
+    Return the index k - 1 of a legacy '<prefix><k>' key with 1 <= k <= count, or None for any other key.
+    """
+    if isinstance(key, str) and key.startswith(prefix):
+        try:
+            k = int(key[len(prefix):])
+        except ValueError:
+            return None
+        if key[len(prefix):] == str(k) and 1 <= k <= count:
+            return k - 1
+    return None
+
+
+def _read_struct(vf, s):
+    """
+    Read and unpack the struct.Struct s from the current position of the file.
+    """
+    data = vf.read(s.size)
+    if len(data) != s.size:
+        raise EOFError('Unexpected end of the vol file.')
+    return s.unpack(data)
 
 
 class NotAVolumetricOCTError(Exception):
@@ -11,6 +61,68 @@ class NotAVolumetricOCTError(Exception):
         super().__init__(message)
 
 
+class _BScanHeader(np.ndarray):
+    """
+    The structured b_scan_header array of an OCTVol object, which also resolves the 'boundary_<k>' keys of the earlier
+    dictionary layout to the k-th segmentation line of the attached boundaries, i.e. boundaries[k - 1]. Indexing it
+    with B scans (e.g. b_scan_header[2:5]) keeps the keys working on the same B scans of boundaries, copies (e.g.
+    b_scan_header.copy()) do not resolve them. Keys with k outside 1..num_seg raise the ValueError of an unknown field.
+    As for the earlier dictionary, 'in' and get look up the field names and the 'boundary_<k>' keys.
+    """
+    boundaries = None
+
+    def _boundary_index(self, key):
+        return None if self.boundaries is None else _legacy_index(key, 'boundary_', len(self.boundaries))
+
+    def __getitem__(self, key):
+        i_boundary = self._boundary_index(key)
+        if i_boundary is not None:
+            return self.boundaries[i_boundary]
+        item = super().__getitem__(key)
+        if isinstance(key, str) or (isinstance(key, list) and key and all(isinstance(k, str) for k in key)):
+            return item.view(np.ndarray)
+        if isinstance(item, _BScanHeader) and self.boundaries is not None:
+            item.boundaries = self.boundaries[(slice(None),) + (key if isinstance(key, tuple) else (key,))]
+        return item
+
+    def __setitem__(self, key, value):
+        i_boundary = self._boundary_index(key)
+        if i_boundary is not None:
+            self.boundaries[i_boundary] = value
+        else:
+            super().__setitem__(key, value)
+
+    def __contains__(self, key):
+        if isinstance(key, str):
+            return key in self.dtype.names or self._boundary_index(key) is not None
+        return super().__contains__(key)
+
+    def get(self, key, default=None):
+        return self[key] if isinstance(key, str) and key in self else default
+
+
+class _ThicknessGrid(dict):
+    """
+    The thickness_grid dictionary of an OCTVol object, which also resolves the 'sector_<k>' keys of the earlier layout to
+    the k-th record of the 'sectors' array, i.e. thickness_grid['sectors'][k - 1], for [], get, and in. They are not
+    listed by keys() or iteration.
+    """
+    def _sector_index(self, key):
+        return _legacy_index(key, 'sector_', len(self['sectors'])) if dict.__contains__(self, 'sectors') else None
+
+    def __missing__(self, key):
+        i_sector = self._sector_index(key)
+        if i_sector is None:
+            raise KeyError(key)
+        return self['sectors'][i_sector]
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or self._sector_index(key) is not None
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+
 class OCTVol:
     """
     The OCTVol object contains an optical coherence tomography (OCT) image with its information read from Heidelberg
@@ -20,6 +132,9 @@ class OCTVol:
     ----------
     vol_path : str
          Path to the vol file.
+    parallel : bool, optional
+        Read the B scans with parallel threads (os.pread), which helps on network or parallel file systems with a high
+        latency per read. It has no effect where os.pread is not available (e.g. Windows). Defaults to False.
 
      Attributes
      ----------
@@ -29,12 +144,14 @@ class OCTVol:
         A dictionary containing the vol file information e.g. 'num_b_scans', 'size_x', 'exam_time', etc.
     slo : numpy.ndarray
         The SLO image enclosed in the vol file.
-    b_scan_header : dict
-        A dictionary containing B scan specific information and segmentation e.g. 'quality', 'boundary_1', etc.
+    b_scan_header : numpy.ndarray
+        A structured array with one record of B scan specific information per B scan e.g. 'quality', 'start_x', etc.
+    boundaries : numpy.ndarray
+        The segmentation (boundary) lines with the shape (num_seg, num_b_scans, size_x).
     b_scans : numpy.ndarray
-        The OCT image with the shape (size_z, size_x, num_b_scans).
+        The OCT image with the shape (num_b_scans, size_z, size_x), i.e. one B scan after another as stored in the file.
     thickness_grid : dict
-        A dictionary containing the thickness map and related information e.g. 'grid_type', 'central_thk', etc.
+        A dictionary containing the thickness map and related information e.g. 'type', 'central_thk', 'sectors', etc.
 
     Class Attributes
     ----------------
@@ -67,14 +184,36 @@ class OCTVol:
     VISIT_DATE_DOB_OFFSET = (datetime.date.toordinal(datetime.date(1970, 1, 1)) -
                              datetime.date.toordinal(datetime.date(1899, 12, 30))) * 24 * 60 * 60
 
-    def __init__(self, vol_path):
+    def __init__(self, vol_path, parallel=False):
         if '.vol' not in vol_path:
             raise ValueError('The file path does not point to a .vol file. Please check the path and make sure that the full path is given including the file .vol extension.')
         self.vol_path = vol_path
-        self.header, self.slo, self.b_scan_header, self.b_scans, self.thickness_grid = OCTVol._open_vol(vol_path)
+        self.header, self.slo, self.b_scan_header, self.boundaries, self.b_scans, self.thickness_grid = OCTVol._open_vol(vol_path, parallel)
+
+    @property
+    def b_scans_legacy(self):
+        """
+        numpy.ndarray: A view of the OCT image with the shape (size_z, size_x, num_b_scans), the b_scans layout of the
+        earlier versions.
+        """
+        return self.b_scans.transpose(1, 2, 0)
+
+    @property
+    def b_scan_header(self):
+        """
+        numpy.ndarray: The structured array of the B scan headers. For backward compatibility, the keys 'boundary_1',
+        'boundary_2', etc. return the corresponding segmentation line from boundaries.
+        """
+        b_scan_header = self._b_scan_header.view(_BScanHeader)
+        b_scan_header.boundaries = self.boundaries
+        return b_scan_header
+
+    @b_scan_header.setter
+    def b_scan_header(self, b_scan_header):
+        self._b_scan_header = np.asarray(b_scan_header)
 
     @classmethod
-    def _open_vol(cls, vol_path):
+    def _open_vol(cls, vol_path, parallel=False):
         """"
         Read (open) OCT .vol files.
 
@@ -82,11 +221,13 @@ class OCTVol:
         -----------
         vol_path : str
             Path to the vol file.
+        parallel : bool, optional
+            Read the B scans with parallel os.pread calls instead of memory mapping them. Defaults to False.
 
         Returns
         -------
         tuple
-            header, slo, b_scan_header, b_scans, thickness_grid read from the oct vol file.
+            header, slo, b_scan_header, boundaries, b_scans, thickness_grid read from the oct vol file.
 
         Notes
         -----
@@ -95,113 +236,112 @@ class OCTVol:
 
         """
         # Open the file and read header, slo image, B scan header (segmentation), B scans, and thickness grid
-        with open(vol_path, mode='rb') as vf:
+        with open(vol_path, mode='rb', buffering=1 << 20) as vf:
 
             # Read Header
-            header = dict(version="".join(map(chr, vf.read(12))).rstrip("\0"),
-                          size_x=np.fromfile(vf, dtype='int32', count=1)[0],
-                          num_b_scans=np.fromfile(vf, dtype='int32', count=1)[0],
-                          size_z=np.fromfile(vf, dtype='int32', count=1)[0],
-                          scale_x=np.fromfile(vf, dtype='float64', count=1)[0],
-                          distance=np.fromfile(vf, dtype='float64', count=1)[0],
-                          scale_z=np.fromfile(vf, dtype='float64', count=1)[0],
-                          size_x_slo=np.fromfile(vf, dtype='int32', count=1)[0],
-                          size_y_slo=np.fromfile(vf, dtype='int32', count=1)[0],
-                          scale_x_slo=np.fromfile(vf, dtype='float64', count=1)[0],
-                          scale_y_slo=np.fromfile(vf, dtype='float64', count=1)[0],
-                          field_size_slo=np.fromfile(vf, dtype='int32', count=1)[0],
-                          scan_focus=np.fromfile(vf, dtype='float64', count=1)[0],
-                          scan_position="".join(map(chr, vf.read(4))).rstrip("\0"),
-                          unconverted_exam_time=np.fromfile(vf, dtype='uint64', count=1)[0],
-                          scan_pattern=np.fromfile(vf, dtype='int32', count=1)[0],
-                          b_scan_hdr_size=np.fromfile(vf, dtype='int32', count=1)[0],
-                          id="".join(map(chr, vf.read(16))).rstrip("\0"),
-                          reference_id="".join(map(chr, vf.read(16))).rstrip("\0"),
-                          pid=np.fromfile(vf, dtype='int32', count=1)[0],
-                          patient_id="".join(map(chr, vf.read(21))).rstrip("\0"),
-                          padding=np.fromfile(vf, dtype='int8', count=3),
-                          unconverted_dob=np.fromfile(vf, dtype='float64', count=1)[0],
-                          vid=np.fromfile(vf, dtype='int32', count=1)[0],
-                          visit_id="".join(map(chr, vf.read(24))).rstrip("\0"),
-                          unconverted_visit_date=np.fromfile(vf, dtype='float64', count=1)[0],
-                          grid_type=np.fromfile(vf, dtype='int32', count=1)[0],
-                          grid_offset=np.fromfile(vf, dtype='int32', count=1)[0],
-                          spare=np.fromfile(vf, dtype='int8', count=1832))
+            h = _read_struct(vf, _HEADER_STRUCT)
+            header = dict(version=h[0].rstrip(b'\0').decode('latin-1'),
+                          size_x=np.int32(h[1]),
+                          num_b_scans=np.int32(h[2]),
+                          size_z=np.int32(h[3]),
+                          scale_x=np.float64(h[4]),
+                          distance=np.float64(h[5]),
+                          scale_z=np.float64(h[6]),
+                          size_x_slo=np.int32(h[7]),
+                          size_y_slo=np.int32(h[8]),
+                          scale_x_slo=np.float64(h[9]),
+                          scale_y_slo=np.float64(h[10]),
+                          field_size_slo=np.int32(h[11]),
+                          scan_focus=np.float64(h[12]),
+                          scan_position=h[13].rstrip(b'\0').decode('latin-1'),
+                          unconverted_exam_time=np.uint64(h[14]),
+                          scan_pattern=np.int32(h[15]),
+                          b_scan_hdr_size=np.int32(h[16]),
+                          id=h[17].rstrip(b'\0').decode('latin-1'),
+                          reference_id=h[18].rstrip(b'\0').decode('latin-1'),
+                          pid=np.int32(h[19]),
+                          patient_id=h[20].rstrip(b'\0').decode('latin-1'),
+                          padding=np.array(h[21:24], dtype='int8'),
+                          unconverted_dob=np.float64(h[24]),
+                          vid=np.int32(h[25]),
+                          visit_id=h[26].rstrip(b'\0').decode('latin-1'),
+                          unconverted_visit_date=np.float64(h[27]),
+                          grid_type=np.int32(h[28]),
+                          grid_offset=np.int32(h[29]),
+                          spare=np.frombuffer(h[30], dtype='int8').copy())
             header['exam_time'] = datetime.datetime.utcfromtimestamp(header['unconverted_exam_time']/1e7 - OCTVol.EXAM_TIME_OFFSET)
             header['dob'] = (datetime.datetime.utcfromtimestamp(0) + datetime.timedelta(seconds=header['unconverted_dob']*24*60*60 - OCTVol.VISIT_DATE_DOB_OFFSET)).date()
             header['visit_date'] = datetime.datetime.utcfromtimestamp(header['unconverted_visit_date']*24*60*60 - OCTVol.VISIT_DATE_DOB_OFFSET)
 
             # Read SLO image
             vf.seek(2048)
-            slo = np.fromfile(vf, dtype='uint8', count=header['size_x_slo']*header['size_y_slo']).reshape((header['size_y_slo'], header['size_x_slo']))
-
-            # Create B scan and B scan header objects
-            b_scan_header = dict(version=np.full((12, header['num_b_scans']), "\0", dtype='U'),
-                                 b_scan_hdr_size=np.full(header['num_b_scans'], np.nan, dtype='int32'),
-                                 start_x=np.full(header['num_b_scans'], np.nan, dtype='float64'),
-                                 start_y=np.full(header['num_b_scans'], np.nan, dtype='float64'),
-                                 end_x=np.full(header['num_b_scans'], np.nan, dtype='float64'),
-                                 end_y=np.full(header['num_b_scans'], np.nan, dtype='float64'),
-                                 num_seg=np.full(header['num_b_scans'], np.nan, dtype='int32'),
-                                 off_seg=np.full(header['num_b_scans'], np.nan, dtype='int32'),
-                                 quality=np.full(header['num_b_scans'], np.nan, dtype='float32'),
-                                 shift=np.full(header['num_b_scans'], np.nan, dtype='int32'),
-                                 spare=np.full((192, header['num_b_scans']), np.nan, dtype='int8'))
-            b_scans = np.full((header['size_z'], header['size_x'], header['num_b_scans']), np.nan, dtype='float32')
-
-            # Read B scan and B scan header (incl. segmentation)
-            for i_b_scan in range(header['num_b_scans']):
-                # go to the position of the B scan header on the file
-                vf.seek(2048 + header['size_x_slo'] * header['size_y_slo'] + i_b_scan * (header['b_scan_hdr_size'] + header['size_x'] * header['size_z'] * 4))
-
-                # Read B scan header (except segmentation)
-                b_scan_header['version'][:, i_b_scan] = [*map(chr, vf.read(12))]
-                b_scan_header['b_scan_hdr_size'][i_b_scan] = np.fromfile(vf, dtype='int32', count=1)
-                b_scan_header['start_x'][i_b_scan] = np.fromfile(vf, dtype='float64', count=1)
-                b_scan_header['start_y'][i_b_scan] = np.fromfile(vf, dtype='float64', count=1)
-                b_scan_header['end_x'][i_b_scan] = np.fromfile(vf, dtype='float64', count=1)
-                b_scan_header['end_y'][i_b_scan] = np.fromfile(vf, dtype='float64', count=1)
-                b_scan_header['num_seg'][i_b_scan] = np.fromfile(vf, dtype='int32', count=1)
-                b_scan_header['off_seg'][i_b_scan] = np.fromfile(vf, dtype='int32', count=1)
-                b_scan_header['quality'][i_b_scan] = np.fromfile(vf, dtype='float32', count=1)
-                b_scan_header['shift'][i_b_scan] = np.fromfile(vf, dtype='int32', count=1)
-                b_scan_header['spare'][:, i_b_scan] = np.fromfile(vf, dtype='int8', count=192)
-
-                # Create boundaries items now that we know the number of segmentation lines from the first iteration
-                if i_b_scan == 0:
-                    for i_boundary in range(b_scan_header['num_seg'][0]):
-                        b_scan_header['boundary_{}'.format(i_boundary + 1)] = np.full((header['num_b_scans'], header['size_x']), np.nan, dtype='float32')
-
-                # Read segmentation
-                vf.seek(2048 + header['size_x_slo'] * header['size_y_slo'] + b_scan_header['off_seg'][i_b_scan] + i_b_scan * (header['b_scan_hdr_size'] + header['size_x'] * header['size_z'] * 4))
-                for i_boundary in range(b_scan_header['num_seg'][i_b_scan]):
-                    b_scan_header['boundary_{}'.format(i_boundary+1)][i_b_scan, :] = np.fromfile(vf, dtype='float32', count=header['size_x'])
-
-                # Read B scans
-                vf.seek(2048 + header['size_x_slo'] * header['size_y_slo'] + header['b_scan_hdr_size'] + i_b_scan * (header['b_scan_hdr_size'] + header['size_x'] * header['size_z'] * 4))
-                b_scans[:, :, i_b_scan] = np.fromfile(vf, dtype='float32', count=header['size_x'] * header['size_z']).reshape((header['size_z'], header['size_x']))
+            slo = _read(vf, 'uint8', header['size_x_slo']*header['size_y_slo']).reshape((header['size_y_slo'], header['size_x_slo']))
+
+            # Map (or read in parallel) the B scan region, one row of B scan header (incl. segmentation) + B scan per B scan,
+            # and read all the B scans at once through strided views on it
+            size_x, size_z, num_b_scans = int(header['size_x']), int(header['size_z']), int(header['num_b_scans'])
+            b_scan_hdr_size = int(header['b_scan_hdr_size'])
+            stride = b_scan_hdr_size + size_x * size_z * 4
+            offset = 2048 + int(header['size_x_slo']) * int(header['size_y_slo'])
+            if os.fstat(vf.fileno()).st_size < offset + num_b_scans * stride:
+                raise EOFError('Unexpected end of the vol file.')
+            if parallel and hasattr(os, 'pread'):
+                region = np.empty((num_b_scans, stride), dtype='uint8')
+
+                def read_b_scan(i_b_scan):
+                    # Read straight into the row where os.preadv is available, otherwise copy it from the bytes read
+                    if hasattr(os, 'preadv'):
+                        num_read = os.preadv(vf.fileno(), [region[i_b_scan]], offset + i_b_scan * stride)
+                    else:
+                        data = os.pread(vf.fileno(), stride, offset + i_b_scan * stride)
+                        num_read = len(data)
+                        region[i_b_scan, :num_read] = np.frombuffer(data, dtype='uint8')
+                    if num_read != stride:
+                        raise EOFError('Unexpected end of the vol file.')
+
+                with ThreadPoolExecutor(max_workers=8) as pool:
+                    list(pool.map(read_b_scan, range(num_b_scans)))
+            else:
+                region = np.memmap(vf, dtype='uint8', mode='r', offset=offset, shape=(num_b_scans, stride))
+
+            # Read B scan header (except segmentation)
+            b_scan_header = np.ndarray((num_b_scans,), dtype=_BSCAN_HDR_DTYPE, buffer=region, strides=(stride,)).copy()
+
+            # Read segmentation, as a single view if all the B scans store it the same way (the usual case)
+            num_seg, off_seg = b_scan_header['num_seg'], b_scan_header['off_seg']
+            if np.all(num_seg == num_seg[0]) and np.all(off_seg == off_seg[0]):
+                boundaries = np.ndarray((num_seg[0], num_b_scans, size_x), dtype='<f4', buffer=region, offset=int(off_seg[0]), strides=(size_x * 4, stride, 4)).copy()
+            else:
+                boundaries = np.full((num_seg[0], num_b_scans, size_x), np.nan, dtype='float32')
+                for i_b_scan in range(num_b_scans):
+                    boundaries[:num_seg[i_b_scan], i_b_scan] = np.ndarray((num_seg[i_b_scan], size_x), dtype='<f4', buffer=region[i_b_scan], offset=int(off_seg[i_b_scan]))
+
+            # Read B scans
+            b_scans = np.ndarray((num_b_scans, size_z, size_x), dtype='<f4', buffer=region, offset=b_scan_hdr_size, strides=(stride, size_x * 4, 4)).copy()
+
+            # Release the file mapping, everything needed has been copied out of it
+            del region
 
             # Read the thickness info if it exists
             if header['grid_type'] != 0:
                 vf.seek(header['grid_offset'])
 
                 # Read the thickness grid up to the sector part
-                thickness_grid = dict(type=np.fromfile(vf, dtype='int32', count=1)[0],
-                                      diameter=np.fromfile(vf, dtype='float64', count=3),
-                                      center_pos=np.fromfile(vf, dtype='float64', count=2),
-                                      central_thk=np.fromfile(vf, dtype='float32', count=1)[0],
-                                      min_central_thk=np.fromfile(vf, dtype='float32', count=1)[0],
-                                      max_central_thk=np.fromfile(vf, dtype='float32', count=1)[0],
-                                      total_volume=np.fromfile(vf, dtype='float32', count=1)[0])
+                t = _read_struct(vf, _THICKNESS_GRID_STRUCT)
+                thickness_grid = _ThicknessGrid(type=np.int32(t[0]),
+                                                diameter=np.array(t[1:4], dtype='float64'),
+                                                center_pos=np.array(t[4:6], dtype='float64'),
+                                                central_thk=np.float32(t[6]),
+                                                min_central_thk=np.float32(t[7]),
+                                                max_central_thk=np.float32(t[8]),
+                                                total_volume=np.float32(t[9]))
 
                 # Read sectors information
-                for i_sector in range(9):
-                    thickness_grid['sector_{}'.format(i_sector+1)] = dict(thickness=np.fromfile(vf, dtype='float32', count=1)[0],
-                                                                          volume=np.fromfile(vf, dtype='float32', count=1)[0])
+                thickness_grid['sectors'] = _read(vf, _SECTOR_DTYPE, 9)
             else:
-                thickness_grid = dict()
+                thickness_grid = _ThicknessGrid()
 
-        return header, slo, b_scan_header, b_scans, thickness_grid
+        return header, slo, b_scan_header, boundaries, b_scans, thickness_grid
 
     def write_vol(self, write_vol_path):
         """
@@ -213,75 +353,50 @@ class OCTVol:
             The path where the vol file is written to.
 
         """
-        with open(write_vol_path if '.vol' in write_vol_path else write_vol_path + '.vol', 'wb') as vf:
+        with open(write_vol_path if '.vol' in write_vol_path else write_vol_path + '.vol', 'wb', buffering=1 << 20) as vf:
             # Write the header
-            vf.write(self.header['version'].encode() + (12 - len(self.header['version'])) * b'\0')
-            self.header['size_x'].tofile(vf)
-            self.header['num_b_scans'].tofile(vf)
-            self.header['size_z'].tofile(vf)
-            self.header['scale_x'].tofile(vf)
-            self.header['distance'].tofile(vf)
-            self.header['scale_z'].tofile(vf)
-            self.header['size_x_slo'].tofile(vf)
-            self.header['size_y_slo'].tofile(vf)
-            self.header['scale_x_slo'].tofile(vf)
-            self.header['scale_y_slo'].tofile(vf)
-            self.header['field_size_slo'].tofile(vf)
-            self.header['scan_focus'].tofile(vf)
-            vf.write(self.header['scan_position'].encode() + (4 - len(self.header['scan_position'])) * b'\0')
-            self.header['unconverted_exam_time'].tofile(vf)
-            self.header['scan_pattern'].tofile(vf)
-            self.header['b_scan_hdr_size'].tofile(vf)
-            vf.write(self.header['id'].encode() + (16 - len(self.header['id'])) * b'\0')
-            vf.write(self.header['reference_id'].encode() + (16 - len(self.header['reference_id'])) * b'\0')
-            self.header['pid'].tofile(vf)
-            vf.write(self.header['patient_id'].encode() + (21 - len(self.header['patient_id'])) * b'\0')
-            self.header['padding'].tofile(vf)
-            self.header['unconverted_dob'].tofile(vf)
-            self.header['vid'].tofile(vf)
-            vf.write(self.header['visit_id'].encode() + (24 - len(self.header['visit_id'])) * b'\0')
-            self.header['unconverted_visit_date'].tofile(vf)
-            self.header['grid_type'].tofile(vf)
-            self.header['grid_offset'].tofile(vf)
-            self.header['spare'].tofile(vf)
+            header = self.header
+            vf.write(_HEADER_STRUCT.pack(header['version'].encode('latin-1'), header['size_x'], header['num_b_scans'],
+                                         header['size_z'], header['scale_x'], header['distance'], header['scale_z'],
+                                         header['size_x_slo'], header['size_y_slo'], header['scale_x_slo'],
+                                         header['scale_y_slo'], header['field_size_slo'], header['scan_focus'],
+                                         header['scan_position'].encode('latin-1'), header['unconverted_exam_time'],
+                                         header['scan_pattern'], header['b_scan_hdr_size'], header['id'].encode('latin-1'),
+                                         header['reference_id'].encode('latin-1'), header['pid'],
+                                         header['patient_id'].encode('latin-1'), *header['padding'],
+                                         header['unconverted_dob'], header['vid'], header['visit_id'].encode('latin-1'),
+                                         header['unconverted_visit_date'], header['grid_type'], header['grid_offset'],
+                                         header['spare'].tobytes()))
 
             # Write the slo image
             vf.seek(2048)
             self.slo.reshape(-1).tofile(vf)
 
-            # Write BScan and BScan header
-            for i_b_scan in range(self.header['num_b_scans']):
-                vf.seek(2048 + self.header['size_x_slo']*self.header['size_y_slo'] + i_b_scan*(self.header['b_scan_hdr_size']+self.header['size_x']*self.header['size_z']*4))
-                np.vectorize(str.encode)(self.b_scan_header['version'][:, i_b_scan]).tofile(vf)
-                self.b_scan_header['b_scan_hdr_size'][i_b_scan].tofile(vf)
-                self.b_scan_header['start_x'][i_b_scan].tofile(vf)
-                self.b_scan_header['start_y'][i_b_scan].tofile(vf)
-                self.b_scan_header['end_x'][i_b_scan].tofile(vf)
-                self.b_scan_header['end_y'][i_b_scan].tofile(vf)
-                self.b_scan_header['num_seg'][i_b_scan].tofile(vf)
-                self.b_scan_header['off_seg'][i_b_scan].tofile(vf)
-                self.b_scan_header['quality'][i_b_scan].tofile(vf)
-                self.b_scan_header['shift'][i_b_scan].tofile(vf)
-                self.b_scan_header['spare'][:, i_b_scan].tofile(vf)
-                vf.seek(2048 + self.header['size_x_slo']*self.header['size_y_slo'] + i_b_scan*(self.header['b_scan_hdr_size']+self.header['size_x']*self.header['size_z']*4) + self.b_scan_header['off_seg'][i_b_scan])
-                for i_boundary in range(self.b_scan_header['num_seg'][i_b_scan]):
-                    self.b_scan_header['boundary_{}'.format(i_boundary+1)][i_b_scan, :].tofile(vf)
-                vf.seek(2048 + self.header['size_x_slo']*self.header['size_y_slo'] + i_b_scan*(self.header['b_scan_hdr_size']+self.header['size_x']*self.header['size_z']*4) + self.header['b_scan_hdr_size'])
-                self.b_scans[:, :, i_b_scan].reshape(-1).tofile(vf)
+            # Write BScan and BScan header, assembled in memory as the B scan region of the file and written at once
+            size_x, size_z, num_b_scans = int(self.header['size_x']), int(self.header['size_z']), int(self.header['num_b_scans'])
+            b_scan_hdr_size = int(self.header['b_scan_hdr_size'])
+            stride = b_scan_hdr_size + size_x * size_z * 4
+            region = np.zeros((num_b_scans, stride), dtype='uint8')
+            np.ndarray((num_b_scans,), dtype=_BSCAN_HDR_DTYPE, buffer=region, strides=(stride,))[:] = self.b_scan_header
+            num_seg, off_seg = self.b_scan_header['num_seg'], self.b_scan_header['off_seg']
+            if np.all(num_seg == num_seg[0]) and np.all(off_seg == off_seg[0]):
+                np.ndarray((num_seg[0], num_b_scans, size_x), dtype='<f4', buffer=region, offset=int(off_seg[0]), strides=(size_x * 4, stride, 4))[:] = self.boundaries[:num_seg[0]]
+            else:
+                for i_b_scan in range(num_b_scans):
+                    np.ndarray((num_seg[i_b_scan], size_x), dtype='<f4', buffer=region[i_b_scan], offset=int(off_seg[i_b_scan]))[:] = self.boundaries[:num_seg[i_b_scan], i_b_scan]
+            np.ndarray((num_b_scans, size_z, size_x), dtype='<f4', buffer=region, offset=b_scan_hdr_size, strides=(stride, size_x * 4, 4))[:] = self.b_scans
+            vf.seek(2048 + int(self.header['size_x_slo']) * int(self.header['size_y_slo']))
+            vf.write(region.data)
 
             # Write the thickness grid if it exists
             vf.seek(self.header['grid_offset'])
             if self.header['grid_type'] != 0:
-                self.thickness_grid['type'].tofile(vf)
-                self.thickness_grid['diameter'].tofile(vf)
-                self.thickness_grid['center_pos'].tofile(vf)
-                self.thickness_grid['central_thk'].tofile(vf)
-                self.thickness_grid['min_central_thk'].tofile(vf)
-                self.thickness_grid['max_central_thk'].tofile(vf)
-                self.thickness_grid['total_volume'].tofile(vf)
-                for i_sector in range(9):
-                    self.thickness_grid['sector_{}'.format(i_sector+1)]['thickness'].tofile(vf)
-                    self.thickness_grid['sector_{}'.format(i_sector+1)]['volume'].tofile(vf)
+                thickness_grid = self.thickness_grid
+                vf.write(_THICKNESS_GRID_STRUCT.pack(thickness_grid['type'], *thickness_grid['diameter'],
+                                                     *thickness_grid['center_pos'], thickness_grid['central_thk'],
+                                                     thickness_grid['min_central_thk'], thickness_grid['max_central_thk'],
+                                                     thickness_grid['total_volume']))
+                thickness_grid['sectors'].tofile(vf)
 
     def crop_vol(self, crop_size=6):
         """
@@ -308,57 +423,56 @@ class OCTVol:
         This update is particularly useful when using programs like OCTMarker or SAMIRIX for segmentation correction.
         It allows users to easily determine whether they are within the ETDRS map or not.
 
+        The cropped b_scans, boundaries, and b_scan_header are new contiguous arrays, the uncropped ones are not kept.
+
         """
         if self.header['scan_pattern'] not in [3, 4]:
             raise NotAVolumetricOCTError("Only volumetric OCT scans can be cropped.")
 
         # Find the position of the fovea (center) on the volume
-        slo_volume_angle = np.math.atan((self.b_scan_header['end_y'][0]-self.b_scan_header['end_y'][-1]) / (self.b_scan_header['end_x'][0]-self.b_scan_header['end_x'][-1]))
-        if self.b_scan_header['end_x'][-1] > self.b_scan_header['end_x'][0]:
-            slo_volume_angle += np.pi
-        center_position_x_mm = -(self.thickness_grid['center_pos'][0] - self.b_scan_header['end_x'][-1]) * np.math.sin(slo_volume_angle) + (self.thickness_grid['center_pos'][1] - self.b_scan_header['end_y'][-1]) * np.math.cos(slo_volume_angle)
-        center_position_y_mm = (self.thickness_grid['center_pos'][0] - self.b_scan_header['end_x'][-1]) * np.math.cos(slo_volume_angle) + (self.thickness_grid['center_pos'][1] - self.b_scan_header['end_y'][-1]) * np.math.sin(slo_volume_angle)
-        center_position_a_scan = self.header['size_x'] - np.round(center_position_x_mm / self.header['scale_x'] * 2)/2
-        center_position_b_scan = self.header['num_b_scans'] - np.round(center_position_y_mm / self.header['distance'] * 2)/2
+        size_x, num_b_scans = self.header['size_x'], self.header['num_b_scans']
+        scale_x, distance = self.header['scale_x'], self.header['distance']
+        end_x, end_y = self.b_scan_header['end_x'], self.b_scan_header['end_y']
+        center_pos = self.thickness_grid['center_pos']
+        slo_volume_angle = math.atan((end_y[0]-end_y[-1]) / (end_x[0]-end_x[-1]))
+        if end_x[-1] > end_x[0]:
+            slo_volume_angle += math.pi
+        sin_angle, cos_angle = math.sin(slo_volume_angle), math.cos(slo_volume_angle)
+        center_position_x_mm = -(center_pos[0] - end_x[-1]) * sin_angle + (center_pos[1] - end_y[-1]) * cos_angle
+        center_position_y_mm = (center_pos[0] - end_x[-1]) * cos_angle + (center_pos[1] - end_y[-1]) * sin_angle
+        center_position_a_scan = size_x - np.round(center_position_x_mm / scale_x * 2)/2
+        center_position_b_scan = num_b_scans - np.round(center_position_y_mm / distance * 2)/2
 
         # Find the boundaries for the cropping (these are the number of the A scans and B scans and not their index)
-        first_a_scan = np.maximum(int(np.ceil(center_position_a_scan - (crop_size / self.header['scale_x'] / 2))), 1)
-        last_a_scan = np.minimum(int(np.floor(center_position_a_scan + (crop_size / self.header['scale_x'] / 2))), self.header['size_x'])
-        first_b_scan = np.maximum(int(np.ceil(center_position_b_scan - (crop_size / self.header['distance'] / 2))), 1)
-        last_b_scan = np.minimum(int(np.floor(center_position_b_scan + (crop_size / self.header['distance'] / 2))), self.header['num_b_scans'])
-
-        # Crop the boundary segmentation in the b_scan_header
-        for i_boundary in range(self.b_scan_header['num_seg'][0]):
-            self.b_scan_header['boundary_{}'.format(i_boundary+1)] = self.b_scan_header['boundary_{}'.format(i_boundary+1)][first_b_scan-1:last_b_scan, first_a_scan-1:last_a_scan]
-
-        # Crop B scans
-        self.b_scans = self.b_scans[:, first_a_scan-1:last_a_scan, first_b_scan-1:last_b_scan]
-
-        # Recalculate the start and end of each B scan
-        self.b_scan_header['start_x'] = self.b_scan_header['start_x'] + (first_a_scan - 1) * self.header['scale_x'] * np.math.cos(3 * np.pi / 2 + slo_volume_angle)
-        self.b_scan_header['start_y'] = self.b_scan_header['start_y'] + (first_a_scan - 1) * self.header['scale_x'] * np.math.sin(3 * np.pi / 2 + slo_volume_angle)
-        self.b_scan_header['end_x'] = self.b_scan_header['end_x'] + (self.header['size_x'] - last_a_scan) * self.header['scale_x'] * np.math.cos(np.pi / 2 + slo_volume_angle)
-        self.b_scan_header['end_y'] = self.b_scan_header['end_y'] + (self.header['size_x'] - last_a_scan) * self.header['scale_x'] * np.math.sin(np.pi / 2 + slo_volume_angle)
-
-        # Update the size_x and num_b_scans in the header
-        self.header['size_x'] = last_a_scan - first_a_scan + 1
-        self.header['num_b_scans'] = last_b_scan - first_b_scan + 1
-
-        # Update the grid_offset in the header
-        self.header['grid_offset'] = 2048 + self.header['size_x_slo'] * self.header['size_y_slo'] + self.header['num_b_scans'] * (self.header['b_scan_hdr_size'] + self.header['size_x'] * self.header['size_z'] * 4)
-
-        # Crop the rest of the b_scan_header
-        self.b_scan_header['version'] = self.b_scan_header['version'][:, first_b_scan-1:last_b_scan]
-        self.b_scan_header['b_scan_hdr_size'] = self.b_scan_header['b_scan_hdr_size'][first_b_scan-1:last_b_scan]
-        self.b_scan_header['start_x'] = self.b_scan_header['start_x'][first_b_scan-1:last_b_scan]
-        self.b_scan_header['start_y'] = self.b_scan_header['start_y'][first_b_scan-1:last_b_scan]
-        self.b_scan_header['end_x'] = self.b_scan_header['end_x'][first_b_scan-1:last_b_scan]
-        self.b_scan_header['end_y'] = self.b_scan_header['end_y'][first_b_scan-1:last_b_scan]
-        self.b_scan_header['num_seg'] = self.b_scan_header['num_seg'][first_b_scan-1:last_b_scan]
-        self.b_scan_header['off_seg'] = self.b_scan_header['off_seg'][first_b_scan-1:last_b_scan]
-        self.b_scan_header['quality'] = self.b_scan_header['quality'][first_b_scan-1:last_b_scan]
-        self.b_scan_header['shift'] = self.b_scan_header['shift'][first_b_scan-1:last_b_scan]
-        self.b_scan_header['spare'] = self.b_scan_header['spare'][:, first_b_scan-1:last_b_scan]
+        first_a_scan = np.maximum(int(np.ceil(center_position_a_scan - (crop_size / scale_x / 2))), 1)
+        last_a_scan = np.minimum(int(np.floor(center_position_a_scan + (crop_size / scale_x / 2))), size_x)
+        first_b_scan = np.maximum(int(np.ceil(center_position_b_scan - (crop_size / distance / 2))), 1)
+        last_b_scan = np.minimum(int(np.floor(center_position_b_scan + (crop_size / distance / 2))), num_b_scans)
+
+        # Nothing to crop (and no information to update) if the crop covers the whole volume
+        if (first_a_scan, last_a_scan, first_b_scan, last_b_scan) != (1, size_x, 1, num_b_scans):
+            # Crop the boundary segmentation, B scans, and b_scan_header into new contiguous arrays, so the uncropped ones
+            # are released
+            boundaries = self.boundaries[:, first_b_scan-1:last_b_scan, first_a_scan-1:last_a_scan]
+            self.boundaries = np.empty(boundaries.shape, dtype=boundaries.dtype)
+            np.copyto(self.boundaries, boundaries)
+            b_scans = self.b_scans[first_b_scan-1:last_b_scan, :, first_a_scan-1:last_a_scan]
+            self.b_scans = np.empty(b_scans.shape, dtype=b_scans.dtype)
+            np.copyto(self.b_scans, b_scans)
+            self.b_scan_header = b_scan_header = self.b_scan_header[first_b_scan-1:last_b_scan].copy()
+
+            # Recalculate the start and end of each B scan
+            b_scan_header['start_x'] += (first_a_scan - 1) * scale_x * math.cos(3 * math.pi / 2 + slo_volume_angle)
+            b_scan_header['start_y'] += (first_a_scan - 1) * scale_x * math.sin(3 * math.pi / 2 + slo_volume_angle)
+            b_scan_header['end_x'] += (size_x - last_a_scan) * scale_x * math.cos(math.pi / 2 + slo_volume_angle)
+            b_scan_header['end_y'] += (size_x - last_a_scan) * scale_x * math.sin(math.pi / 2 + slo_volume_angle)
+
+            # Update the size_x and num_b_scans in the header
+            self.header['size_x'] = last_a_scan - first_a_scan + 1
+            self.header['num_b_scans'] = last_b_scan - first_b_scan + 1
+
+            # Update the grid_offset in the header
+            self.header['grid_offset'] = 2048 + self.header['size_x_slo'] * self.header['size_y_slo'] + self.header['num_b_scans'] * (self.header['b_scan_hdr_size'] + self.header['size_x'] * self.header['size_z'] * 4)
 
         # Update grid type to ETDRS and reset the sector parameters, in case 6mm crop was selected. This helps later
         # when using programs like OCTMarker to correct because the volume is cropped to 6mm usually to cover ETDRS.
@@ -369,6 +483,4 @@ class OCTVol:
             self.thickness_grid['min_central_thk'] = np.float32(0)
             self.thickness_grid['max_central_thk'] = np.float32(0)
             self.thickness_grid['total_volume'] = np.float32(0)
-            for i_sector in range(9):
-                self.thickness_grid['sector_{}'.format(i_sector+1)]['thickness'] = np.float32(0)
-                self.thickness_grid['sector_{}'.format(i_sector+1)]['volume'] = np.float32(0)
+            self.thickness_grid['sectors'] = np.zeros(9, dtype=_SECTOR_DTYPE)
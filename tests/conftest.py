@@ -0,0 +1,66 @@
+import struct
+import numpy as np
+import pytest
+
+
+def make_vol(vol_path, size_x=48, num_b_scans=32, size_z=16, size_x_slo=40, size_y_slo=36, num_seg=3,
+             b_scan_hdr_size=1024, scale_x=0.2, distance=0.25):
+    """
+    Write a small volumetric vol file, built with struct independently of OCTVol, with the B scans lying horizontally
+    on the SLO image one below another and the thickness grid centered on the volume.
+    """
+    rng = np.random.RandomState(0)
+    stride = b_scan_hdr_size + size_x * size_z * 4
+    grid_offset = 2048 + size_x_slo * size_y_slo + num_b_scans * stride
+
+    # Header
+    data = bytearray(struct.pack('<12siiidddiiddid4sQii16s16si21s3bdi24sdii1832s', b'HSF-OCT-103', size_x, num_b_scans,
+                                 size_z, scale_x, distance, 0.0039, size_x_slo, size_y_slo, 0.0114, 0.0115, 30, -0.5,
+                                 b'OD', 131000000000000000, 3, b_scan_hdr_size, b'ID123', b'REF456', 77,
+                                 'PAT\xe9'.encode('latin-1'), 1, 2, 3, 30000.5, 99, b'VISIT', 43000.25, 3, grid_offset,
+                                 bytes(rng.randint(0, 256, 1832).astype('uint8'))))
+
+    # SLO image
+    data += rng.randint(0, 256, size_x_slo * size_y_slo).astype('uint8').tobytes()
+
+    # B scans with their header and segmentation, slightly tilted so the volume angle is defined
+    start_x, end_x = 1.0, 1.0 + (size_x - 1) * scale_x
+    last_y = 1.0
+    for i_b_scan in range(num_b_scans):
+        y = last_y + (num_b_scans - 1 - i_b_scan) * distance
+        b_scan = bytearray(stride)
+        struct.pack_into('<12sidddd2ifi192s', b_scan, 0, b'HSF-BS-103', b_scan_hdr_size, start_x, y,
+                         end_x - 1e-4 * i_b_scan, y, num_seg, 256, i_b_scan + 0.5, i_b_scan,
+                         bytes(rng.randint(0, 256, 192).astype('uint8')))
+        b_scan[256:256 + num_seg * size_x * 4] = rng.random_sample(num_seg * size_x).astype('<f4').tobytes()
+        b_scan[b_scan_hdr_size:] = rng.random_sample(size_x * size_z).astype('<f4').tobytes()
+        data += b_scan
+
+    # Thickness grid
+    data += struct.pack('<i3d2d4f', 2, 1, 3, 6, (start_x + end_x) / 2, last_y + (num_b_scans - 1) * distance / 2, 250,
+                        240, 260, 8.5)
+    data += rng.random_sample(18).astype('<f4').tobytes()
+
+    with open(vol_path, 'wb') as vf:
+        vf.write(data)
+    return vol_path
+
+
+def assert_dict_eq(a, b):
+    array_keys = [key for key in a if isinstance(a[key], np.ndarray)]
+    scalar_keys = [key for key in a if key not in array_keys]
+    assert tuple(b[key] for key in scalar_keys) == tuple(a[key] for key in scalar_keys)
+    for key in array_keys:
+        assert np.array_equal(b[key], a[key])
+
+
+def assert_vol_eq(a, b):
+    for attr in ["slo", "b_scan_header", "boundaries", "b_scans"]:
+        assert np.array_equal(getattr(b, attr), getattr(a, attr))
+    assert_dict_eq(a.header, b.header)
+    assert_dict_eq(a.thickness_grid, b.thickness_grid)
+
+
+@pytest.fixture(scope="session")
+def synthetic_vol_path(tmp_path_factory):
+    return make_vol(str(tmp_path_factory.mktemp("synthetic") / "synthetic.vol"))
@@ -1,4 +1,5 @@
 from OCTVol import OCTVol
+from conftest import assert_vol_eq
 import numpy as np
 from glob import glob
 import os
@@ -19,24 +20,23 @@ def test_vertical_6mm():
             if key in ['unconverted_exam_time', 'unconverted_visit_date', 'exam_time', 'visit_date']:
                 assert type(mat_cropped_vol.header[key]) == type(py_cropped_vol.header[key])
             elif isinstance(mat_cropped_vol.header[key], np.ndarray):
-                assert np.all(mat_cropped_vol.header[key] == py_cropped_vol.header[key])
+                assert np.array_equal(mat_cropped_vol.header[key], py_cropped_vol.header[key])
                 assert mat_cropped_vol.header[key].dtype == py_cropped_vol.header[key].dtype
             else:
                 assert mat_cropped_vol.header[key] == py_cropped_vol.header[key]
                 assert type(mat_cropped_vol.header[key]) == type(py_cropped_vol.header[key])
 
-        assert np.all(mat_cropped_vol.slo == py_cropped_vol.slo)
+        assert np.array_equal(mat_cropped_vol.slo, py_cropped_vol.slo)
         assert mat_cropped_vol.slo.dtype == py_cropped_vol.slo.dtype
 
-        for key in mat_cropped_vol.b_scan_header:
-            if isinstance(mat_cropped_vol.b_scan_header[key], np.ndarray):
-                assert np.all(mat_cropped_vol.b_scan_header[key] == py_cropped_vol.b_scan_header[key])
-                assert mat_cropped_vol.b_scan_header[key].dtype == py_cropped_vol.b_scan_header[key].dtype
-            else:
-                assert mat_cropped_vol.b_scan_header[key] == py_cropped_vol.b_scan_header[key]
-                assert type(mat_cropped_vol.b_scan_header[key]) == type(py_cropped_vol.b_scan_header[key])
+        for key in mat_cropped_vol.b_scan_header.dtype.names:
+            assert np.array_equal(mat_cropped_vol.b_scan_header[key], py_cropped_vol.b_scan_header[key])
+            assert mat_cropped_vol.b_scan_header[key].dtype == py_cropped_vol.b_scan_header[key].dtype
+
+        assert np.array_equal(mat_cropped_vol.boundaries, py_cropped_vol.boundaries)
+        assert mat_cropped_vol.boundaries.dtype == py_cropped_vol.boundaries.dtype
 
-        assert np.all(mat_cropped_vol.b_scans == py_cropped_vol.b_scans)
+        assert np.array_equal(mat_cropped_vol.b_scans, py_cropped_vol.b_scans)
         assert mat_cropped_vol.b_scans.dtype == py_cropped_vol.b_scans.dtype
 
 
@@ -55,30 +55,48 @@ def test_vertical_3_5mm():
             if key in ['unconverted_exam_time', 'unconverted_visit_date', 'exam_time', 'visit_date']:
                 assert type(mat_cropped_vol.header[key]) == type(py_cropped_vol.header[key])
             elif isinstance(mat_cropped_vol.header[key], np.ndarray):
-                assert np.all(mat_cropped_vol.header[key] == py_cropped_vol.header[key])
+                assert np.array_equal(mat_cropped_vol.header[key], py_cropped_vol.header[key])
                 assert mat_cropped_vol.header[key].dtype == py_cropped_vol.header[key].dtype
             else:
                 assert mat_cropped_vol.header[key] == py_cropped_vol.header[key]
                 assert type(mat_cropped_vol.header[key]) == type(py_cropped_vol.header[key])
 
-        assert np.all(mat_cropped_vol.slo == py_cropped_vol.slo)
+        assert np.array_equal(mat_cropped_vol.slo, py_cropped_vol.slo)
         assert mat_cropped_vol.slo.dtype == py_cropped_vol.slo.dtype
 
-        for key in mat_cropped_vol.b_scan_header:
-            if isinstance(mat_cropped_vol.b_scan_header[key], np.ndarray):
-                assert np.all(mat_cropped_vol.b_scan_header[key] == py_cropped_vol.b_scan_header[key])
-                assert mat_cropped_vol.b_scan_header[key].dtype == py_cropped_vol.b_scan_header[key].dtype
-            else:
-                assert mat_cropped_vol.b_scan_header[key] == py_cropped_vol.b_scan_header[key]
-                assert type(mat_cropped_vol.b_scan_header[key]) == type(py_cropped_vol.b_scan_header[key])
+        for key in mat_cropped_vol.b_scan_header.dtype.names:
+            assert np.array_equal(mat_cropped_vol.b_scan_header[key], py_cropped_vol.b_scan_header[key])
+            assert mat_cropped_vol.b_scan_header[key].dtype == py_cropped_vol.b_scan_header[key].dtype
+
+        assert np.array_equal(mat_cropped_vol.boundaries, py_cropped_vol.boundaries)
+        assert mat_cropped_vol.boundaries.dtype == py_cropped_vol.boundaries.dtype
 
-        assert np.all(mat_cropped_vol.b_scans == py_cropped_vol.b_scans)
+        assert np.array_equal(mat_cropped_vol.b_scans, py_cropped_vol.b_scans)
         assert mat_cropped_vol.b_scans.dtype == py_cropped_vol.b_scans.dtype
 
         for key in mat_cropped_vol.thickness_grid:
             if isinstance(mat_cropped_vol.thickness_grid[key], np.ndarray):
-                assert np.all(mat_cropped_vol.thickness_grid[key] == py_cropped_vol.thickness_grid[key])
+                assert np.array_equal(mat_cropped_vol.thickness_grid[key], py_cropped_vol.thickness_grid[key])
                 assert mat_cropped_vol.thickness_grid[key].dtype == py_cropped_vol.thickness_grid[key].dtype
             else:
                 assert mat_cropped_vol.thickness_grid[key] == py_cropped_vol.thickness_grid[key]
                 assert type(mat_cropped_vol.thickness_grid[key]) == type(py_cropped_vol.thickness_grid[key])
+
+
+# Test 6mm crop of the synthetic vol file, whose fovea lies in the middle of a 9.4mm x 7.75mm volume
+def test_synthetic_6mm(synthetic_vol_path, tmp_path):
+    orig_vol = OCTVol(synthetic_vol_path)
+    cropped_vol = OCTVol(synthetic_vol_path)
+    cropped_vol.crop_vol(6)
+
+    # 6mm are 30 A scans (of 0.2mm) and 24 B scans (0.25mm apart) around the center
+    assert np.array_equal(cropped_vol.b_scans, orig_vol.b_scans[4:28, :, 9:39])
+    assert np.array_equal(cropped_vol.boundaries, orig_vol.boundaries[:, 4:28, 9:39])
+    assert np.array_equal(cropped_vol.b_scan_header['quality'], orig_vol.b_scan_header['quality'][4:28])
+    assert cropped_vol.header['size_x'] == 30 and cropped_vol.header['num_b_scans'] == 24
+    assert cropped_vol.thickness_grid['type'] == 3
+    assert np.array_equal(cropped_vol.thickness_grid['sectors'], np.zeros_like(orig_vol.thickness_grid['sectors']))
+
+    # The cropped volume is written and read back unchanged
+    cropped_vol.write_vol(str(tmp_path / "cropped.vol"))
+    assert_vol_eq(cropped_vol, OCTVol(str(tmp_path / "cropped.vol")))
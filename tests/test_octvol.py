@@ -0,0 +1,76 @@
+from OCTVol import OCTVol
+from conftest import assert_vol_eq
+import numpy as np
+import os
+import pytest
+
+
+@pytest.fixture
+def vol(synthetic_vol_path):
+    return OCTVol(synthetic_vol_path)
+
+
+def test_boundary_keys(vol):
+    b_scan_header = vol.b_scan_header
+    for k in range(1, len(vol.boundaries) + 1):
+        assert np.array_equal(b_scan_header['boundary_{}'.format(k)], vol.boundaries[k - 1])
+    assert np.array_equal(b_scan_header[2:5]['boundary_2'], vol.boundaries[1, 2:5])
+
+    assert 'quality' in b_scan_header and 'boundary_3' in b_scan_header
+    assert np.array_equal(b_scan_header.get('quality'), b_scan_header['quality'])
+    assert np.array_equal(b_scan_header.get('boundary_3'), vol.boundaries[2])
+
+    b_scan_header['boundary_1'] = 0
+    assert not vol.boundaries[0].any()
+
+
+@pytest.mark.parametrize("key", ["boundary_0", "boundary_4", "boundary_x", "boundary_01"])
+def test_boundary_keys_out_of_range(vol, key):
+    assert key not in vol.b_scan_header
+    assert vol.b_scan_header.get(key) is None
+    with pytest.raises(ValueError):
+        vol.b_scan_header[key]
+    with pytest.raises(ValueError):
+        vol.b_scan_header[key] = 0
+
+
+def test_sector_keys(vol):
+    thickness_grid = vol.thickness_grid
+    for k in range(1, 10):
+        key = 'sector_{}'.format(k)
+        assert key in thickness_grid
+        assert thickness_grid[key] == thickness_grid['sectors'][k - 1]
+        assert thickness_grid.get(key) == thickness_grid['sectors'][k - 1]
+
+
+@pytest.mark.parametrize("key", ["sector_0", "sector_10", "sector_x", "sector_01"])
+def test_sector_keys_out_of_range(vol, key):
+    assert key not in vol.thickness_grid
+    assert vol.thickness_grid.get(key) is None
+    with pytest.raises(KeyError):
+        vol.thickness_grid[key]
+
+
+@pytest.fixture
+def parallel(request, monkeypatch):
+    # Read through the memory map, or in parallel with os.preadv or (without os.preadv) the os.pread fallback
+    if request.param == "pread":
+        monkeypatch.delattr(os, "preadv", raising=False)
+    return request.param != "memmap"
+
+
+@pytest.mark.parametrize("parallel", ["preadv", "pread"], indirect=True)
+def test_parallel(synthetic_vol_path, vol, parallel):
+    assert_vol_eq(vol, OCTVol(synthetic_vol_path, parallel=parallel))
+
+
+@pytest.mark.parametrize("parallel", ["memmap", "preadv", "pread"], indirect=True)
+@pytest.mark.parametrize("cut", ["header", "b_scans", "thickness_grid"])
+def test_truncated(synthetic_vol_path, tmp_path, parallel, cut):
+    # Cut the file inside the header, in the middle of the B scans, or 120 bytes before its end inside the thickness grid
+    vol_size = os.path.getsize(synthetic_vol_path)
+    truncated_vol_path = str(tmp_path / "truncated.vol")
+    with open(synthetic_vol_path, 'rb') as vf, open(truncated_vol_path, 'wb') as tf:
+        tf.write(vf.read({"header": 1000, "b_scans": vol_size // 2, "thickness_grid": vol_size - 120}[cut]))
+    with pytest.raises(EOFError):
+        OCTVol(truncated_vol_path, parallel=parallel)